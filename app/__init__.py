@@ -19,6 +19,10 @@ def create_app(config_class=Config):
     CORS(app)
     jwt.init_app(app)
     
+    # Size the bounded executors used for inference and document parsing
+    from .services.executors import configure_executors
+    configure_executors(app.config)
+    
     # Create upload folder if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -14,6 +14,28 @@ class Config:
     RATELIMIT_DEFAULT = os.getenv('RATE_LIMIT', '100/hour')
     RATELIMIT_STORAGE_URL = 'memory://'
     
+    # Extraction limits for large documents
+    MAX_EXTRACT_ITEMS = int(os.getenv('MAX_EXTRACT_ITEMS', 100000))  # DOCX paragraphs and table cells
+    MAX_SLIDES = int(os.getenv('MAX_SLIDES', 1000))
+    
+    # Concurrency limits for CPU-bound work
+    INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', 2))
+    DOCUMENT_WORKERS = int(os.getenv('DOCUMENT_WORKERS', os.cpu_count() or 1))
+    DOCUMENT_EXECUTOR = os.getenv('DOCUMENT_EXECUTOR', 'thread')  # thread or process
+    
+    # ASGI serving (asgi.py)
+    ASGI_REQUEST_THREADS = int(os.getenv('ASGI_REQUEST_THREADS', 32))
+    ASGI_SPOOL_SIZE = int(os.getenv('ASGI_SPOOL_SIZE', 1024 * 1024))  # 1MB in memory, then disk
+    
+    # Document store and semantic search
+    DOCUMENT_STORE_PATH = os.getenv('DOCUMENT_STORE_PATH', 'data/store')
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+    CHUNK_WORDS = int(os.getenv('CHUNK_WORDS', 120))
+    IVF_MIN_ROWS = int(os.getenv('IVF_MIN_ROWS', 50000))  # build inverted lists past this many chunks
+    IVF_NPROBE = int(os.getenv('IVF_NPROBE', 8))  # minimum inverted lists scanned per query
+    IVF_PROBE_FRACTION = float(os.getenv('IVF_PROBE_FRACTION', 0.1))  # share of lists scanned, if more
+    
     # Cache configuration
     CACHE_TYPE = 'simple'
     CACHE_DEFAULT_TIMEOUT = 300
@@ -1,31 +1,41 @@
-from flask import Blueprint, request
+from flask import Blueprint, Response, request
 from flask_jwt_extended import jwt_required
 from ..utils.decorators import validate_json, cache_response
 from ..models.response import ApiResponse
-from ..services.text_processor import analyze_sentiment, generate_summary, extract_keywords
+from ..services.text_processor import analyze_sentiment, generate_summary, extract_keywords, stream_summary
+from ..services.executors import run_bounded
 from marshmallow import Schema, fields
+import json
 
 analysis_bp = Blueprint('analysis', __name__)
 
 class TextSchema(Schema):
     text = fields.Str(required=True)
 
+class SummarySchema(TextSchema):
+    stream = fields.Bool()
+
 @analysis_bp.route('/sentiment', methods=['POST'])
 @jwt_required()
 @validate_json(TextSchema())
 @cache_response(timeout=300)
 def sentiment_analysis():
     data = request.get_json()
-    result = analyze_sentiment(data['text'])
+    result = run_bounded('inference', analyze_sentiment, data['text'])
     return ApiResponse.success(result)
 
 @analysis_bp.route('/summary', methods=['POST'])
 @jwt_required()
-@validate_json(TextSchema())
+@validate_json(SummarySchema())
 @cache_response(timeout=300)
 def text_summary():
     data = request.get_json()
-    result = generate_summary(data['text'])
+    if data.get('stream'):
+        return Response(_sse(stream_summary(data['text'])), mimetype='text/event-stream', headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # stop nginx from buffering the stream
+        })
+    result = run_bounded('inference', generate_summary, data['text'])
     return ApiResponse.success(result)
 
 @analysis_bp.route('/keywords', methods=['POST'])
@@ -34,5 +44,19 @@ def text_summary():
 @cache_response(timeout=300)
 def keyword_extraction():
     data = request.get_json()
-    result = extract_keywords(data['text'])
+    result = run_bounded('inference', extract_keywords, data['text'])
     return ApiResponse.success(result)
+
+def _sse(events):
+    """Format (event, data) pairs as server-sent events."""
+    try:
+        for event, data in events:
+            if event == "heartbeat":
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+    finally:
+        # Closing the events generator cancels any generation still running
+        events.close()
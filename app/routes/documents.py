@@ -1,9 +1,17 @@
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, current_app
 from flask_jwt_extended import jwt_required
 from werkzeug.utils import secure_filename
 from ..utils.decorators import validate_file
 from ..models.response import ApiResponse
 from ..services.doc_handler import process_document
+from ..services.executors import run_bounded
+from ..services.pipeline import run_pipeline, ANALYSES
+from ..services.document_store import get_document_store
+from ..services.exporter import (
+    EXPORT_FORMATS, result_sections, keyword_rows, iter_csv, iter_markdown,
+    csv_from_sheets, markdown_from_document, pdf_from_document, pdf_from_result
+)
+import tempfile
 import os
 
 documents_bp = Blueprint('documents', __name__)
@@ -24,7 +32,10 @@ def analyze_document():
     file.save(filepath)
     
     try:
-        result = process_document(filepath)
+        result = run_bounded('documents', process_document, filepath, **_extract_limits())
+        if request.form.get('store', 'false').lower() == 'true':
+            # Keep the result and index it for search
+            result["id"] = get_document_store().add(filename, result)["id"]
         return ApiResponse.success(result)
     except Exception as e:
         return ApiResponse.error(str(e), 500)
@@ -33,14 +44,161 @@ def analyze_document():
         if os.path.exists(filepath):
             os.remove(filepath)
 
+@documents_bp.route('/pipeline', methods=['POST'])
+@jwt_required()
+@validate_file(['pdf', 'docx', 'xlsx', 'pptx'])
+def document_pipeline():
+    """Extract a document and analyze it server-side in one request."""
+    requested = request.form.get('analyses', ','.join(ANALYSES))
+    analyses = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in analyses if name not in ANALYSES]
+    if unknown:
+        return ApiResponse.error("Unknown analyses", 400, {
+            "analyses": unknown,
+            "available": list(ANALYSES)
+        })
+    include_content = request.form.get('include_content', 'false').lower() == 'true'
+    export_format = request.form.get('format', 'json')
+    if export_format != 'json' and export_format not in EXPORT_FORMATS:
+        return ApiResponse.error("Unsupported export format", 400)
+    if export_format == 'csv' and 'keywords' not in analyses:
+        return ApiResponse.error("CSV export requires the keywords analysis", 400)
+    
+    file = request.files['file']
+    filename = secure_filename(file.filename)
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    file.save(filepath)
+    
+    try:
+        result = run_pipeline(filepath, analyses, include_content, _extract_limits())
+        if export_format == 'json':
+            return ApiResponse.success(result)
+        
+        name = os.path.splitext(filename)[0]
+        if export_format == 'csv':
+            body = iter_csv(keyword_rows(result), header=["keyword", "count"])
+        elif export_format == 'md':
+            body = iter_markdown(result_sections(result, filename))
+        else:
+            body = _render_to_file(pdf_from_result, result, filename)
+        return _export_response(body, export_format, name)
+    except Exception as e:
+        return ApiResponse.error(str(e), 500)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+@documents_bp.route('/export', methods=['POST'])
+@jwt_required()
+@validate_file(['pdf', 'docx', 'xlsx', 'pptx'])
+def export_document():
+    """Stream a document's extracted content as Markdown, CSV or PDF."""
+    export_format = request.form.get('format', 'md')
+    if export_format not in EXPORT_FORMATS:
+        return ApiResponse.error("Unsupported export format", 400)
+    sheet = request.form.get('sheet') or None
+    
+    file = request.files['file']
+    filename = secure_filename(file.filename)
+    if export_format == 'csv' and not filename.lower().endswith('.xlsx'):
+        return ApiResponse.error("CSV export is only available for xlsx files", 400)
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    file.save(filepath)
+    
+    try:
+        if filename.lower().endswith('.xlsx'):
+            # Sheets are rendered on the executor and streamed from disk
+            render = {
+                'csv': csv_from_sheets,
+                'md': markdown_from_document,
+                'pdf': pdf_from_document
+            }[export_format]
+            body = _render_to_file(render, filepath, sheet)
+        elif export_format == 'md':
+            result = run_bounded('documents', process_document, filepath, **_extract_limits())
+            body = iter_markdown(result_sections(result, filename))
+        else:
+            body = _render_to_file(pdf_from_document, filepath, sheet, _extract_limits())
+        return _export_response(body, export_format, os.path.splitext(filename)[0])
+    except ValueError as e:
+        # Unknown sheet or unsupported file
+        return ApiResponse.error(str(e), 400)
+    except Exception as e:
+        return ApiResponse.error(str(e), 500)
+    finally:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+def _extract_limits():
+    return {
+        "max_items": current_app.config['MAX_EXTRACT_ITEMS'],
+        "max_slides": current_app.config['MAX_SLIDES']
+    }
+
+def _temp_path():
+    fd, path = tempfile.mkstemp(dir=current_app.config['UPLOAD_FOLDER'])
+    os.close(fd)
+    return path
+
+class _FileBody:
+    """Response body that streams a temporary file and deletes it on close.
+
+    The WSGI server calls close() even if the body was never iterated.
+    """
+
+    def __init__(self, path, chunk_size=64 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = open(path, 'rb')
+
+    def __iter__(self):
+        return iter(lambda: self._file.read(self.chunk_size), b'')
+
+    def close(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _render_to_file(render, *args):
+    """Run an exporter on the documents executor and stream its output."""
+    out_path = _temp_path()
+    try:
+        run_bounded('documents', render, out_path, *args)
+        return _FileBody(out_path)
+    except Exception:
+        os.remove(out_path)
+        raise
+
+def _export_response(body, export_format, name):
+    return Response(body, mimetype=EXPORT_FORMATS[export_format], headers={
+        "Content-Disposition": f'attachment; filename="{name}.{export_format}"'
+    })
+
+@documents_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_documents():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return ApiResponse.error("Missing query parameter 'q'", 400)
+    
+    k = request.args.get('k', 10, type=int)
+    results = get_document_store().search(query, k=max(1, min(k, 100)))
+    return ApiResponse.success({"query": query, "results": results})
+
 @documents_bp.route('/<string:doc_id>', methods=['GET'])
 @jwt_required()
 def get_document(doc_id):
-    # Dummy response for testing
-    return ApiResponse.success({
-        "id": doc_id,
-        "name": f"Document_{doc_id}",
-        "type": "pdf",
-        "created_at": "2024-03-20T10:00:00Z",
-        "status": "processed"
-    })
+    include_result = request.args.get('include_result', 'false').lower() == 'true'
+    document = get_document_store().get(doc_id, include_result=include_result)
+    if document is None:
+        return ApiResponse.error("Document not found", 404)
+    return ApiResponse.success(document)
+
+@documents_bp.route('/<string:doc_id>/similar', methods=['GET'])
+@jwt_required()
+def similar_documents(doc_id):
+    k = request.args.get('k', 10, type=int)
+    results = get_document_store().similar(doc_id, k=max(1, min(k, 100)))
+    if results is None:
+        return ApiResponse.error("Document not found", 404)
+    return ApiResponse.success({"id": doc_id, "results": results})
@@ -1,27 +1,50 @@
 from pdfminer.high_level import extract_text as pdf_extract
-from docx import Document
 from openpyxl import load_workbook
-from pptx import Presentation
+from .ooxml import iter_docx, iter_pptx
+import io
 import os
 
-def process_document(filepath):
-    """Process different types of documents and extract text/data."""
+def process_document(filepath, max_items=None, max_slides=None):
+    """Process different types of documents and extract text/data.
+    
+    max_items caps the paragraphs and table cells read from a DOCX file and
+    max_slides the slides read from a PPTX file.
+    """
     ext = os.path.splitext(filepath)[1].lower()
     
     try:
         if ext == '.pdf':
             return process_pdf(filepath)
         elif ext == '.docx':
-            return process_docx(filepath)
+            return process_docx(filepath, max_items=max_items)
         elif ext == '.xlsx':
             return process_xlsx(filepath)
         elif ext == '.pptx':
-            return process_pptx(filepath)
+            return process_pptx(filepath, max_slides=max_slides)
         else:
             raise ValueError(f"Unsupported file type: {ext}")
     except Exception as e:
         raise Exception(f"Error processing document: {str(e)}")
 
+def document_text(result):
+    """Flatten the output of process_document into plain text."""
+    if "content" in result:
+        return result["content"]
+    if "slides" in result:
+        # Speaker notes follow the slide they belong to
+        notes = result.get("notes", [])
+        return "\n\n".join(
+            "\n".join(filter(None, [slide, notes[i] if i < len(notes) else ""]))
+            for i, slide in enumerate(result["slides"])
+        )
+    if "sheets" in result:
+        return "\n".join(
+            " ".join(cell for cell in row if cell)
+            for rows in result["sheets"].values()
+            for row in rows
+        )
+    return ""
+
 def process_pdf(filepath):
     """Extract text from PDF file."""
     text = pdf_extract(filepath)
@@ -32,18 +55,58 @@ def process_pdf(filepath):
         "word_count": len(text.split())
     }
 
-def process_docx(filepath):
-    """Extract text and metadata from DOCX file."""
-    doc = Document(filepath)
-    paragraphs = [p.text for p in doc.paragraphs]
+def process_docx(filepath, max_items=None):
+    """Extract text, including table cells, from DOCX file."""
+    content = io.StringIO()
+    paragraphs = 0
+    tables = set()
+    word_count = 0
+    items = 0
+    truncated = False
+    current_row = None
+    
+    for item in iter_docx(filepath, max_items=max_items):
+        if item["kind"] == "truncated":
+            truncated = True
+            continue
+        text = item["text"]
+        items += 1
+        word_count += len(text.split())
+        if item["kind"] == "cell":
+            # Cells of one table row share a line, separated by tabs
+            row = (item["table"], item["row"])
+            tables.add(item["table"])
+            separator = "\t" if row == current_row else "\n"
+            current_row = row
+        else:
+            paragraphs += 1
+            separator = "\n"
+            current_row = None
+        if items > 1:
+            content.write(separator)
+        content.write(text)
     
     return {
         "type": "docx",
-        "content": "\n".join(paragraphs),
-        "paragraphs": len(paragraphs),
-        "word_count": sum(len(p.split()) for p in paragraphs)
+        "content": content.getvalue(),
+        "paragraphs": paragraphs,
+        "tables": len(tables),
+        "word_count": word_count,
+        "truncated": truncated
     }
 
+def iter_xlsx_rows(filepath, sheet=None):
+    """Yield (sheet name, row) pairs one row at a time from an Excel file."""
+    wb = load_workbook(filepath, read_only=True)
+    try:
+        if sheet is not None and sheet not in wb.sheetnames:
+            raise ValueError(f"Sheet not found: {sheet}")
+        for name in [sheet] if sheet is not None else wb.sheetnames:
+            for row in wb[name].iter_rows(values_only=True):
+                yield name, [str(cell) if cell is not None else "" for cell in row]
+    finally:
+        wb.close()
+
 def process_xlsx(filepath):
     """Extract data from Excel file."""
     wb = load_workbook(filepath, read_only=True)
@@ -62,20 +125,38 @@ def process_xlsx(filepath):
         "sheet_count": len(sheets_data)
     }
 
-def process_pptx(filepath):
-    """Extract text from PowerPoint file."""
-    prs = Presentation(filepath)
+def process_pptx(filepath, max_slides=None):
+    """Extract text, tables and speaker notes from PowerPoint file."""
     slides_data = []
+    notes_data = []
+    slide_text = []
+    truncated = False
+    current_row = None
     
-    for slide in prs.slides:
-        slide_text = []
-        for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                slide_text.append(shape.text)
+    for item in iter_pptx(filepath, max_slides=max_slides):
+        kind = item["kind"]
+        if kind == "truncated":
+            truncated = True
+        elif kind == "slide":
+            if item["slide"] > 1:
+                slides_data.append("\n".join(slide_text))
+            slide_text = []
+            notes_data.append("")
+            current_row = None
+        elif kind == "notes":
+            notes_data[-1] = item["text"]
+        elif kind == "cell" and (item["table"], item["row"]) == current_row:
+            slide_text[-1] += "\t" + item["text"]
+        else:
+            slide_text.append(item["text"])
+            current_row = (item["table"], item["row"]) if kind == "cell" else None
+    if notes_data:
         slides_data.append("\n".join(slide_text))
     
     return {
         "type": "pptx",
         "slides": slides_data,
-        "slide_count": len(slides_data)
+        "notes": notes_data,
+        "slide_count": len(slides_data),
+        "truncated": truncated
     }
@@ -0,0 +1,254 @@
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app
+from uuid import uuid4
+from .doc_handler import document_text
+from .embeddings import Embedder, chunk_text
+from .executors import run_bounded, submit_bounded
+from .vector_index import VectorIndex
+import json
+import os
+import threading
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single worker process is assumed
+    fcntl = None
+
+class DocumentStore:
+    """Processed documents on disk plus an embedding index over their chunks.
+
+    Each document's chunks occupy a contiguous range of index rows, recorded
+    in its metadata, so a document's vectors can be read back without a
+    separate mapping.
+
+    Several worker processes may share one store. Writes hold an exclusive
+    lock on store.lock and append vectors, then chunks, then the document
+    record, so a record only exists once everything it points to is on disk.
+    Anything past the last record is left over from a failed write and is
+    trimmed by the next writer. Every call picks up records appended by other
+    processes before it runs.
+    """
+
+    def __init__(self, path, embedder, batch_size=32, chunk_words=120, ivf_min_rows=50000, nprobe=8,
+                 probe_fraction=0.1):
+        self.path = path
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.chunk_words = chunk_words
+        self.ivf_min_rows = ivf_min_rows
+        self.index = VectorIndex(
+            os.path.join(path, 'index'), nprobe=nprobe, probe_fraction=probe_fraction
+        )
+        self._results_path = os.path.join(path, 'results')
+        self._documents_path = os.path.join(path, 'documents.jsonl')
+        self._chunks_path = os.path.join(path, 'chunks.jsonl')
+        self._lock_path = os.path.join(path, 'store.lock')
+        self._lock = threading.Lock()
+        self._ivf_lock = threading.Lock()
+        os.makedirs(self._results_path, exist_ok=True)
+
+        self._documents = {}
+        # Byte offset and owning document of every chunk, by index row
+        self._chunk_offsets = []
+        self._chunk_docs = []
+        # Rows covered by stored documents, and how far each file has been read
+        self._rows = 0
+        self._documents_size = 0
+        self._chunks_size = 0
+        self._refresh()
+
+    @contextmanager
+    def _file_lock(self, exclusive=False):
+        """Hold the store's cross-process lock (a no-op where flock is missing)."""
+        with open(self._lock_path, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _refresh(self, repair=False):
+        """Read document records, and their chunks, appended since last time."""
+        if not os.path.exists(self._documents_path):
+            self.index.refresh(repair)
+            return
+        if os.path.getsize(self._documents_path) != self._documents_size:
+            with open(self._documents_path, 'rb') as f:
+                f.seek(self._documents_size)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Still being written, or cut short by a crash
+                    record = json.loads(line)
+                    self._documents[record["id"]] = record
+                    self._rows = max(self._rows, record["rows"][1])
+                    self._documents_size += len(line)
+
+            with open(self._chunks_path, 'rb') as f:
+                f.seek(self._chunks_size)
+                while len(self._chunk_docs) < self._rows:
+                    line = f.readline()
+                    self._chunk_offsets.append(self._chunks_size)
+                    self._chunk_docs.append(json.loads(line)["doc"])
+                    self._chunks_size += len(line)
+        self.index.refresh(repair)
+
+    def _sync(self):
+        """Catch up with writes from other processes and return the row count."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            return self._rows
+
+    def _trim(self):
+        """Drop whatever a failed write left past the last document."""
+        for path, size in ((self._documents_path, self._documents_size), (self._chunks_path, self._chunks_size)):
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        self.index.truncate(self._rows)
+
+    def add(self, name, result):
+        """Store a process_document result and index its text in batches."""
+        doc_id = uuid4().hex
+        chunks = chunk_text(document_text(result), self.chunk_words)
+        vectors = [
+            run_bounded('inference', self.embedder.embed, chunks[i:i + self.batch_size])
+            for i in range(0, len(chunks), self.batch_size)
+        ]
+
+        with open(os.path.join(self._results_path, f"{doc_id}.json"), 'w') as f:
+            json.dump(result, f)
+
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh(repair=True)
+            self._trim()
+            start = self._rows
+            for batch in vectors:
+                self.index.add(batch)
+
+            offsets = []
+            with open(self._chunks_path, 'ab') as f:
+                offset = self._chunks_size
+                for chunk in chunks:
+                    line = (json.dumps({"doc": doc_id, "text": chunk}) + "\n").encode()
+                    f.write(line)
+                    offsets.append(offset)
+                    offset += len(line)
+
+            record = {
+                "id": doc_id,
+                "name": name,
+                "type": result.get("type"),
+                "created_at": datetime.utcnow().isoformat(),
+                "status": "processed",
+                "chunk_count": len(chunks),
+                "rows": [start, start + len(chunks)]
+            }
+            line = (json.dumps(record) + "\n").encode()
+            with open(self._documents_path, 'ab') as f:
+                f.write(line)
+
+            self._chunk_offsets.extend(offsets)
+            self._chunk_docs.extend([doc_id] * len(chunks))
+            self._chunks_size = offset
+            self._documents[doc_id] = record
+            self._documents_size += len(line)
+            self._rows = start + len(chunks)
+            rows = self._rows
+
+        if rows >= self.ivf_min_rows and rows >= 2 * self.index.ivf_rows:
+            # Rebuild as the corpus doubles; skip if a rebuild is already running
+            if self._ivf_lock.acquire(blocking=False):
+                try:
+                    future = submit_bounded(
+                        'inference', self.index.build_ivf,
+                        rows=rows, commit_lock=self._file_lock(exclusive=True)
+                    )
+                except BaseException:
+                    self._ivf_lock.release()
+                    raise
+                future.add_done_callback(lambda _: self._ivf_lock.release())
+        return self._public(record)
+
+    def get(self, doc_id, include_result=False):
+        self._sync()
+        record = self._documents.get(doc_id)
+        if record is None:
+            return None
+        document = self._public(record)
+        if include_result:
+            with open(os.path.join(self._results_path, f"{doc_id}.json")) as f:
+                document["result"] = json.load(f)
+        return document
+
+    def search(self, query, k=10):
+        """Find the documents whose chunks best match a text query."""
+        rows = self._sync()
+        if rows == 0:
+            return []
+        vector = run_bounded('inference', self.embedder.embed, [query])[0]
+        return self._rank(vector, k, rows)
+
+    def similar(self, doc_id, k=10):
+        """Find the documents closest to a stored document."""
+        rows = self._sync()
+        record = self._documents.get(doc_id)
+        if record is None:
+            return None
+        start, stop = record["rows"]
+        if start == stop:
+            return []
+        vector = self.index.rows(start, stop).mean(axis=0)
+        vector /= max(np.linalg.norm(vector), 1e-9)
+        return self._rank(vector, k, rows, exclude=(start, stop))
+
+    def _rank(self, vector, k, rows, exclude=None):
+        # Over-fetch chunks, then keep each document's best chunk
+        found, scores = self.index.search(vector, k * 5, exclude=exclude, rows=rows)
+        hits = {}
+        for row, score in zip(found.tolist(), scores.tolist()):
+            doc_id = self._chunk_docs[row]
+            if doc_id not in hits:
+                hits[doc_id] = (row, score)
+            if len(hits) == k:
+                break
+        if not hits:
+            return []
+
+        results = []
+        with open(self._chunks_path, 'rb') as f:
+            for doc_id, (row, score) in hits.items():
+                f.seek(self._chunk_offsets[row])
+                chunk = json.loads(f.readline())
+                record = self._documents[doc_id]
+                results.append({
+                    "id": doc_id,
+                    "name": record["name"],
+                    "score": round(score, 4),
+                    "chunk": row - record["rows"][0],
+                    "snippet": chunk["text"][:200]
+                })
+        return results
+
+    @staticmethod
+    def _public(record):
+        return {key: value for key, value in record.items() if key != "rows"}
+
+_store_lock = threading.Lock()
+
+def get_document_store():
+    """Return the app's document store, creating it on first use."""
+    with _store_lock:
+        store = current_app.extensions.get('document_store')
+        if store is None:
+            config = current_app.config
+            store = DocumentStore(
+                config['DOCUMENT_STORE_PATH'],
+                Embedder(config['EMBEDDING_MODEL']),
+                batch_size=config['EMBEDDING_BATCH_SIZE'],
+                chunk_words=config['CHUNK_WORDS'],
+                ivf_min_rows=config['IVF_MIN_ROWS'],
+                nprobe=config['IVF_NPROBE'],
+                probe_fraction=config['IVF_PROBE_FRACTION']
+            )
+            current_app.extensions['document_store'] = store
+        return store
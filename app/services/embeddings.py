@@ -0,0 +1,52 @@
+import threading
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+class Embedder:
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2", max_length=256):
+        self.model_name = model_name
+        self.max_length = max_length
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Lazy load the encoder on first use."""
+        with self._lock:
+            if self._model is None:
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModel.from_pretrained(self.model_name)
+                self._model.eval()
+        return self._tokenizer, self._model
+
+    @property
+    def dimension(self):
+        return self._load()[1].config.hidden_size
+
+    def embed(self, texts):
+        """Return L2-normalized float32 sentence embeddings, one row per text."""
+        tokenizer, model = self._load()
+        encoded = tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors='pt'
+        )
+        with torch.inference_mode():
+            hidden = model(**encoded).last_hidden_state
+
+        # Mean pooling over real (non-padding) tokens
+        mask = encoded['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.numpy().astype(np.float32)
+
+def chunk_text(text, chunk_words=120):
+    """Split text into consecutive windows of at most chunk_words words."""
+    words = text.split()
+    return [
+        " ".join(words[i:i + chunk_words])
+        for i in range(0, len(words), chunk_words)
+    ]
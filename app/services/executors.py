@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
+import threading
+
+# Bounded pools that cap how much CPU work runs at once, independently of
+# how many requests the server is holding open.
+_executors = {}
+_settings = {
+    'inference': {'kind': 'thread', 'workers': 2},
+    'documents': {'kind': 'thread', 'workers': os.cpu_count() or 1},
+}
+_lock = threading.Lock()
+
+def configure_executors(config):
+    """Read pool sizes and kinds from the Flask config."""
+    with _lock:
+        _settings['inference'] = {
+            'kind': 'thread',
+            'workers': int(config.get('INFERENCE_WORKERS', 2))
+        }
+        _settings['documents'] = {
+            'kind': config.get('DOCUMENT_EXECUTOR', 'thread'),
+            'workers': int(config.get('DOCUMENT_WORKERS', os.cpu_count() or 1))
+        }
+
+def get_executor(name):
+    """Return the named executor, creating it on first use."""
+    with _lock:
+        executor = _executors.get(name)
+        if executor is None:
+            settings = _settings[name]
+            if settings['kind'] == 'process':
+                executor = ProcessPoolExecutor(max_workers=settings['workers'])
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=settings['workers'],
+                    thread_name_prefix=f"flaskie-{name}"
+                )
+            _executors[name] = executor
+        return executor
+
+def submit_bounded(name, fn, *args, **kwargs):
+    """Schedule fn on the named executor and return its future."""
+    return get_executor(name).submit(fn, *args, **kwargs)
+
+def run_bounded(name, fn, *args, **kwargs):
+    """Run fn on the named executor and wait for its result."""
+    return submit_bounded(name, fn, *args, **kwargs).result()
+
+def shutdown_executors(wait=True):
+    """Shut down all executors, e.g. on server shutdown."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
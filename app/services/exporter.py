@@ -0,0 +1,270 @@
+"""Render extraction and analysis results as Markdown, CSV or PDF.
+
+Results are first turned into a stream of sections:
+
+    ("heading", level, text)
+    ("text", text)
+    ("fields", [(label, value), ...])
+    ("table", header, rows)   # rows may be a lazy iterator
+
+and each format renders those sections as they arrive, so large sheets are
+never held in memory as a whole.
+"""
+
+from itertools import islice
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from .doc_handler import process_document, iter_xlsx_rows
+import csv
+import io
+import os
+
+EXPORT_FORMATS = {
+    'md': 'text/markdown',
+    'csv': 'text/csv',
+    'pdf': 'application/pdf'
+}
+
+# Sheet rows per PDF table; each batch is laid out on its own
+PDF_TABLE_ROWS = 40
+PDF_CELL_CHARS = 60
+
+def document_sections(filepath, sheet=None, limits=None):
+    """Sections for an uploaded document, streaming rows from Excel files.
+
+    limits are passed on to process_document for other file types.
+    """
+    if os.path.splitext(filepath)[1].lower() == '.xlsx':
+        yield ("heading", 1, os.path.basename(filepath))
+        yield from _sheet_tables(iter_xlsx_rows(filepath, sheet))
+    else:
+        yield from result_sections(process_document(filepath, **(limits or {})), os.path.basename(filepath))
+
+def result_sections(result, title="Report"):
+    """Sections for a process_document or pipeline result."""
+    yield ("heading", 1, title)
+
+    document = result.get("document", result)
+    fields = [
+        (key.replace("_", " ").capitalize(), value)
+        for key, value in document.items()
+        if isinstance(value, (str, int, float)) and key != "content"
+    ]
+    if fields:
+        yield ("fields", fields)
+
+    analyses = result.get("analyses", {})
+    if "summary" in analyses:
+        yield ("heading", 2, "Summary")
+        yield ("text", analyses["summary"].get("summary", ""))
+    if "sentiment" in analyses:
+        yield ("heading", 2, "Sentiment")
+        yield ("fields", [
+            ("Sentiment", analyses["sentiment"].get("sentiment")),
+            ("Confidence", analyses["sentiment"].get("confidence"))
+        ])
+    if "keywords" in analyses:
+        yield ("heading", 2, "Keywords")
+        yield ("table", ["Keyword", "Count"], keyword_rows(result))
+    if "timings_ms" in result:
+        yield ("heading", 2, "Timings (ms)")
+        yield ("fields", list(result["timings_ms"].items()))
+
+    if document.get("content"):
+        yield ("heading", 2, "Content")
+        for paragraph in document["content"].split("\n"):
+            if paragraph.strip():
+                yield ("text", paragraph)
+    for number, slide in enumerate(document.get("slides", []), 1):
+        yield ("heading", 2, f"Slide {number}")
+        for line in slide.split("\n"):
+            if line.strip():
+                yield ("text", line)
+        notes = document.get("notes", [])
+        if number <= len(notes) and notes[number - 1]:
+            yield ("heading", 3, "Notes")
+            yield ("text", notes[number - 1])
+    if document.get("sheets"):
+        yield from _sheet_tables(
+            (name, row) for name, rows in document["sheets"].items() for row in rows
+        )
+
+def keyword_rows(result):
+    """(keyword, count) rows of a pipeline result's keyword analysis."""
+    keywords = result.get("analyses", {}).get("keywords", {}).get("keywords", [])
+    return [[item["word"], item["count"]] for item in keywords]
+
+def _sheet_tables(rows):
+    """Group (sheet, row) pairs into one table section per sheet."""
+    rows = iter(rows)
+    pending = next(rows, None)
+    while pending is not None:
+        sheet, header = pending
+
+        def sheet_rows(sheet=sheet):
+            nonlocal pending
+            pending = None
+            for name, row in rows:
+                if name != sheet:
+                    pending = (name, row)
+                    return
+                yield row
+
+        table_rows = sheet_rows()
+        yield ("heading", 2, sheet)
+        yield ("table", header, table_rows)
+        # Skip whatever the renderer left unread to reach the next sheet
+        for _ in table_rows:
+            pass
+
+def iter_csv(rows, header=None):
+    """Yield CSV text one row at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        rows = _prepend(header, rows)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+def iter_markdown(sections):
+    """Yield Markdown text one block at a time."""
+    for section in sections:
+        kind = section[0]
+        if kind == "heading":
+            yield f"{'#' * section[1]} {section[2]}\n\n"
+        elif kind == "text":
+            yield f"{section[1]}\n\n"
+        elif kind == "fields":
+            yield "".join(f"- **{label}:** {value}\n" for label, value in section[1]) + "\n"
+        elif kind == "table":
+            header = [_md_cell(cell) for cell in section[1]]
+            yield "| " + " | ".join(header) + " |\n"
+            yield "|" + "---|" * len(header) + "\n"
+            for row in section[2]:
+                cells = [_md_cell(cell) for cell in row][:len(header)]
+                cells += [""] * (len(header) - len(cells))
+                yield "| " + " | ".join(cells) + " |\n"
+            yield "\n"
+
+def _md_cell(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+def write_pdf(sections, out):
+    """Lay out sections as a PDF into the file object out.
+
+    Flowables are produced lazily as reportlab consumes them, and long tables
+    are split into batches of PDF_TABLE_ROWS rows, so the layout engine only
+    ever sees about a page of content at a time.
+    """
+    doc = SimpleDocTemplate(
+        out,
+        pagesize=landscape(A4),
+        leftMargin=1.5 * cm,
+        rightMargin=1.5 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm
+    )
+    doc.build(_FlowableStream(_pdf_flowables(sections, doc.width)))
+
+def csv_from_sheets(out_path, filepath, sheet=None):
+    """Write an Excel file's rows as CSV to out_path.
+
+    Rows are prefixed with their sheet name unless one sheet was chosen.
+    """
+    rows = (
+        row if sheet else [name] + row
+        for name, row in iter_xlsx_rows(filepath, sheet)
+    )
+    with open(out_path, 'w', newline='', encoding='utf-8') as out:
+        csv.writer(out).writerows(rows)
+
+def markdown_from_document(out_path, filepath, sheet=None, limits=None):
+    """Write a Markdown export of a document to out_path."""
+    with open(out_path, 'w', encoding='utf-8') as out:
+        out.writelines(iter_markdown(document_sections(filepath, sheet, limits)))
+
+def pdf_from_document(out_path, filepath, sheet=None, limits=None):
+    """Write a PDF export of a document to out_path."""
+    with open(out_path, 'wb') as out:
+        write_pdf(document_sections(filepath, sheet, limits), out)
+
+def pdf_from_result(out_path, result, title="Report"):
+    """Write a PDF export of a result dict to out_path."""
+    with open(out_path, 'wb') as out:
+        write_pdf(result_sections(result, title), out)
+
+def _pdf_flowables(sections, width):
+    styles = getSampleStyleSheet()
+    headings = {1: styles['Title'], 2: styles['Heading2'], 3: styles['Heading3']}
+    table_style = TableStyle([
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ])
+
+    for section in sections:
+        kind = section[0]
+        if kind == "heading":
+            yield Paragraph(escape(str(section[2])), headings.get(section[1], styles['Heading3']))
+        elif kind == "text":
+            yield Paragraph(escape(str(section[1])), styles['BodyText'])
+        elif kind == "fields":
+            for label, value in section[1]:
+                yield Paragraph(f"<b>{escape(str(label))}:</b> {escape(str(value))}", styles['BodyText'])
+            yield Spacer(1, 0.3 * cm)
+        elif kind == "table":
+            header = [_pdf_cell(cell) for cell in section[1]]
+            if not header:
+                continue
+            col_widths = [width / len(header)] * len(header)
+            rows = iter(section[2])
+            while True:
+                batch = list(islice(rows, PDF_TABLE_ROWS))
+                if not batch:
+                    break
+                data = [header] + [
+                    ([_pdf_cell(cell) for cell in row] + [""] * len(header))[:len(header)]
+                    for row in batch
+                ]
+                table = Table(data, colWidths=col_widths, repeatRows=1)
+                table.setStyle(table_style)
+                yield table
+            yield Spacer(1, 0.3 * cm)
+
+def _pdf_cell(value):
+    value = str(value)
+    return value if len(value) <= PDF_CELL_CHARS else value[:PDF_CELL_CHARS - 1] + "…"
+
+class _FlowableStream(list):
+    """A list that refills itself from an iterator as doc.build() drains it."""
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def _fill(self):
+        if not list.__len__(self):
+            item = next(self._source, None)
+            if item is not None:
+                self.append(item)
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
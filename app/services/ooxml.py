@@ -0,0 +1,268 @@
+"""Streaming text extraction for DOCX and PPTX files.
+
+The OOXML parts are read straight out of the zip archive with iterparse and
+each element is cleared once its text has been taken, so memory stays flat
+regardless of document size. Extractors yield small dicts as they go:
+
+    {"kind": "paragraph", "text": ...}
+    {"kind": "cell", "table": 0, "row": 1, "col": 2, "text": ...}
+    {"kind": "slide", "slide": 1}
+    {"kind": "notes", "slide": 1, "text": ...}
+    {"kind": "truncated"}
+
+PPTX items also carry the slide number they belong to. A "truncated" item
+comes last when a limit stopped extraction before the end of the file.
+Nested tables are folded into the text of the cell that contains them.
+"""
+
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Refuse parts that would inflate past this size (guards against zip bombs)
+MAX_PART_SIZE = 256 * 1024 * 1024
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+MC = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+NOTES_SLIDE_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide'
+
+def iter_docx(filepath, max_items=None, max_part_size=MAX_PART_SIZE):
+    """Yield paragraphs and table cells of a DOCX file in document order."""
+    with zipfile.ZipFile(filepath) as zf:
+        part = _main_part(zf, 'word/document.xml')
+        with _open_part(zf, part, max_part_size) as stream:
+            count = 0
+            for item in _iter_docx_body(stream):
+                if max_items is not None and count >= max_items:
+                    # Only flag truncation when there really was more
+                    yield {"kind": "truncated"}
+                    return
+                yield item
+                count += 1
+
+def iter_pptx(filepath, include_notes=True, max_slides=None, max_part_size=MAX_PART_SIZE):
+    """Yield the text of each slide, including groups, tables and notes."""
+    with zipfile.ZipFile(filepath) as zf:
+        for number, part in enumerate(_slide_parts(zf), 1):
+            if max_slides is not None and number > max_slides:
+                yield {"kind": "truncated"}
+                return
+            yield {"kind": "slide", "slide": number}
+
+            with _open_part(zf, part, max_part_size) as stream:
+                for item in _iter_drawing_text(stream):
+                    item["slide"] = number
+                    yield item
+
+            if include_notes:
+                notes_part = _related_part(zf, part, NOTES_SLIDE_REL)
+                if notes_part is None:
+                    continue
+                with _open_part(zf, notes_part, max_part_size) as stream:
+                    notes = [
+                        item["text"]
+                        for item in _iter_drawing_text(stream, body_only=True)
+                        if item["kind"] == "paragraph"
+                    ]
+                if any(notes):
+                    yield {"kind": "notes", "slide": number, "text": "\n".join(notes)}
+
+def _iter_docx_body(stream):
+    paragraphs = []  # text buffers of open paragraphs (text boxes nest them)
+    tables = []      # open tables: index, row, col, next grid column, span, nested row texts
+    cells = []       # paragraph texts of open cells
+    table_count = 0
+    in_run = 0
+    in_fallback = 0  # mc:Fallback repeats the mc:Choice content (e.g. text boxes)
+    body = None
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if tag == MC + 'Fallback':
+            in_fallback += 1 if event == 'start' else -1
+            continue
+        if in_fallback:
+            continue
+        if event == 'start':
+            if tag == W + 'p':
+                paragraphs.append([])
+            elif tag == W + 'r':
+                in_run += 1
+            elif tag == W + 'tbl':
+                # Nested tables don't get an index of their own
+                tables.append({"index": None if tables else table_count, "row": -1, "nested": []})
+                if len(tables) == 1:
+                    table_count += 1
+            elif tag == W + 'tr':
+                tables[-1].update(row=tables[-1]["row"] + 1, next=0)
+                tables[-1]["nested"] = []
+            elif tag == W + 'tc':
+                tables[-1].update(col=tables[-1]["next"], span=1)
+                cells.append([])
+            elif tag == W + 'body':
+                body = elem
+            continue
+
+        if tag == W + 't':
+            paragraphs[-1].append(elem.text or '')
+        elif tag == W + 'tab' and in_run:
+            paragraphs[-1].append('\t')
+        elif tag in (W + 'br', W + 'cr') and in_run:
+            paragraphs[-1].append('\n')
+        elif tag == W + 'r':
+            in_run -= 1
+        elif tag == W + 'p':
+            text = ''.join(paragraphs.pop())
+            if cells and not paragraphs:
+                cells[-1].append(text)
+            else:
+                yield {"kind": "paragraph", "text": text}
+            elem.clear()
+        elif tag == W + 'gridSpan' and tables:
+            # Merged cells cover several grid columns
+            tables[-1]["span"] = int(elem.get(W + 'val', 1))
+        elif tag == W + 'gridBefore' and tables:
+            tables[-1]["next"] += int(elem.get(W + 'val', 0))
+        elif tag == W + 'tc':
+            table = tables[-1]
+            text = "\n".join(cells.pop())
+            table["next"] = table["col"] + table["span"]
+            if len(tables) > 1:
+                table["nested"].append(text)
+            else:
+                yield {
+                    "kind": "cell",
+                    "table": table["index"],
+                    "row": table["row"],
+                    "col": table["col"],
+                    "text": text
+                }
+            elem.clear()
+        elif tag == W + 'tr':
+            if len(tables) > 1:
+                # One line per nested row, in the enclosing cell
+                cells[-1].append("\t".join(tables[-1]["nested"]))
+        elif tag == W + 'tbl':
+            tables.pop()
+            elem.clear()
+
+        # Drop finished top-level blocks so the tree never grows
+        if body is not None and not tables and not paragraphs and tag in (W + 'p', W + 'tbl', W + 'sdt'):
+            body.clear()
+
+def _iter_drawing_text(stream, body_only=False):
+    paragraphs = []
+    tables = []
+    cells = []
+    table_count = 0
+    in_body = False
+    in_fallback = 0
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if tag == MC + 'Fallback':
+            in_fallback += 1 if event == 'start' else -1
+            continue
+        if in_fallback:
+            continue
+        if event == 'start':
+            if tag == A + 'p':
+                paragraphs.append([])
+            elif tag == A + 'tbl':
+                tables.append([table_count, -1, -1])
+                table_count += 1
+            elif tag == A + 'tr':
+                tables[-1][1] += 1
+                tables[-1][2] = -1
+            elif tag == A + 'tc':
+                tables[-1][2] += 1
+                cells.append([])
+            elif tag == P + 'sp':
+                in_body = False
+            elif tag == P + 'ph' and elem.get('type') == 'body':
+                in_body = True
+            continue
+
+        if tag == A + 't':
+            if paragraphs:
+                paragraphs[-1].append(elem.text or '')
+        elif tag == A + 'br':
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == A + 'p':
+            text = ''.join(paragraphs.pop())
+            if cells:
+                cells[-1].append(text)
+            elif in_body or not body_only:
+                yield {"kind": "paragraph", "text": text}
+            elem.clear()
+        elif tag == A + 'tc':
+            table, row, col = tables[-1]
+            text = "\n".join(cells.pop())
+            if not body_only:
+                yield {"kind": "cell", "table": table, "row": row, "col": col, "text": text}
+            elem.clear()
+        elif tag == A + 'tbl':
+            tables.pop()
+            elem.clear()
+        elif tag in (P + 'sp', P + 'graphicFrame', P + 'pic'):
+            elem.clear()
+
+def _open_part(zf, name, max_part_size):
+    info = zf.getinfo(name)
+    if max_part_size is not None and info.file_size > max_part_size:
+        raise ValueError(f"Document part {name} is too large ({info.file_size} bytes)")
+    return zf.open(info)
+
+def _read_rels(zf, part):
+    """Map relationship ids to (type, target part name) for a part."""
+    directory, filename = posixpath.split(part)
+    rels_name = posixpath.join(directory, '_rels', filename + '.rels')
+    try:
+        data = zf.read(rels_name)
+    except KeyError:
+        return {}
+
+    rels = {}
+    for rel in ET.fromstring(data).iter(PKG_REL + 'Relationship'):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+def _main_part(zf, default):
+    for rel_type, target in _read_rels(zf, '').values():
+        if rel_type == OFFICE_DOCUMENT_REL:
+            return target
+    return default
+
+def _related_part(zf, part, rel_type):
+    for found_type, target in _read_rels(zf, part).values():
+        if found_type == rel_type and target in zf.NameToInfo:
+            return target
+    return None
+
+def _slide_parts(zf):
+    """Slide part names in presentation order."""
+    presentation = _main_part(zf, 'ppt/presentation.xml')
+    rels = _read_rels(zf, presentation)
+    root = ET.fromstring(zf.read(presentation))
+    slide_ids = root.find(P + 'sldIdLst')
+    if slide_ids is None:
+        return []
+    return [
+        rels[sld_id.get(R + 'id')][1]
+        for sld_id in slide_ids
+        if sld_id.get(R + 'id') in rels
+    ]
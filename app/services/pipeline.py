@@ -0,0 +1,52 @@
+from .doc_handler import process_document, document_text
+from .executors import run_bounded, submit_bounded
+from .text_processor import analyze_sentiment, generate_summary, extract_keywords
+import time
+
+def _document_keywords(text):
+    # Whole documents would pin multi-MB keys in the keyword cache
+    return extract_keywords(text, use_cache=False)
+
+ANALYSES = {
+    'summary': generate_summary,
+    'sentiment': analyze_sentiment,
+    'keywords': _document_keywords
+}
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+def run_pipeline(filepath, analyses, include_content=False, limits=None):
+    """Extract a document and run the requested analyses on its text.
+
+    The extracted text is handed to every analysis as the same string object,
+    and the analyses run concurrently on the inference executor.
+    """
+    start = time.perf_counter()
+    document, extract_ms = run_bounded('documents', _timed, process_document, filepath, **(limits or {}))
+    text = document_text(document)
+    timings = {"extract": extract_ms}
+
+    futures = {
+        name: submit_bounded('inference', _timed, ANALYSES[name], text)
+        for name in analyses
+    }
+    results = {}
+    for name, future in futures.items():
+        results[name], timings[name] = future.result()
+
+    if not include_content:
+        document = {
+            key: value for key, value in document.items()
+            if key not in ("content", "slides", "notes", "sheets")
+        }
+    document["characters"] = len(text)
+    timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+
+    return {
+        "document": document,
+        "analyses": results,
+        "timings_ms": timings
+    }
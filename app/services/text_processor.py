@@ -1,25 +1,42 @@
+from concurrent.futures import wait
 from functools import lru_cache
+from queue import Empty
 import gc
+import os
+import threading
 import torch
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
+from transformers import (
+    pipeline, AutoModelForSequenceClassification, AutoModelForSeq2SeqLM, AutoTokenizer,
+    StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+)
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk import download, FreqDist
 import nltk
+from .executors import submit_bounded
 
-# Download NLTK data during initialization
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    download('punkt')
-    download('stopwords')
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords'
+}
+
+class _CancelledCriteria(StoppingCriteria):
+    """Stop generation once the cancel event is set."""
+    def __init__(self, cancel):
+        self.cancel = cancel
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return self.cancel.is_set()
 
 class TextProcessor:
-    def __init__(self):
+    def __init__(self, summary_model=None):
         self._sentiment_analyzer = None
         self._summarizer = None
-        self._stop_words = set(stopwords.words('english'))
+        self._summary_model = None
+        self._summary_model_name = summary_model or os.getenv('SUMMARY_MODEL', 'facebook/bart-large-cnn')
+        self._summary_lock = threading.Lock()
+        self._stop_words = None
+        self._nltk_lock = threading.Lock()
 
     @lru_cache(maxsize=128)
     def _get_sentiment_analyzer(self):
@@ -34,19 +51,42 @@ class TextProcessor:
             )
         return self._sentiment_analyzer
 
+    def _get_summary_model(self):
+        """Lazy load the seq2seq model and tokenizer used for summaries."""
+        with self._summary_lock:
+            if self._summary_model is None:
+                tokenizer = AutoTokenizer.from_pretrained(self._summary_model_name)
+                model = AutoModelForSeq2SeqLM.from_pretrained(self._summary_model_name)
+                model.eval()
+                self._summary_model = (tokenizer, model)
+        return self._summary_model
+
     @lru_cache(maxsize=128)
     def _get_summarizer(self):
         """Lazy load summarizer with a smaller model."""
         if self._summarizer is None:
-            # Use a smaller model for summarization
-            model_name = "facebook/bart-large-cnn"
+            # Share the model with streaming summaries instead of loading it twice
+            tokenizer, model = self._get_summary_model()
             self._summarizer = pipeline(
                 'summarization',
-                model=model_name,
+                model=model,
+                tokenizer=tokenizer,
                 device=-1  # Force CPU usage
             )
         return self._summarizer
 
+    def _get_stop_words(self):
+        """Lazy load NLTK data, downloading it if missing, on first use."""
+        with self._nltk_lock:
+            if self._stop_words is None:
+                for package, resource in NLTK_RESOURCES.items():
+                    try:
+                        nltk.data.find(resource)
+                    except LookupError:
+                        download(package)
+                self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+
     def _clear_gpu_memory(self):
         """Clear GPU memory after processing."""
         if torch.cuda.is_available():
@@ -116,14 +156,100 @@ class TextProcessor:
                 "summary_length": len(text.split())
             }
 
+    def stream_summary(self, text, max_length=130, min_length=30, cancel=None,
+                       chunk_words=400, max_chunks=4, poll_interval=1.0):
+        """Generate a summary incrementally, yielding (event, data) pairs.
+
+        Events are "token" for each decoded piece of text, "partial" for the
+        summary of each chunk when the input is split, "heartbeat" whenever no
+        token arrived within poll_interval seconds, and a final "summary".
+        Generation stops early once cancel is set or the generator is closed.
+        """
+        cancel = cancel or threading.Event()
+        words = text.split()
+        if len(words) < min_length:
+            yield "summary", {
+                "summary": text,
+                "original_length": len(words),
+                "summary_length": len(words)
+            }
+            return
+
+        chunks = [
+            " ".join(words[i:i + chunk_words])
+            for i in range(0, min(len(words), chunk_words * max_chunks), chunk_words)
+        ]
+        partials = []
+
+        try:
+            # Loading can take a while the first time; keep the stream alive
+            loading = submit_bounded('inference', self._get_summary_model)
+            while not wait([loading], timeout=poll_interval).done:
+                yield "heartbeat", None
+            tokenizer, model = loading.result()
+
+            for index, chunk in enumerate(chunks):
+                inputs = tokenizer(chunk, return_tensors='pt', truncation=True, max_length=1024)
+                streamer = TextIteratorStreamer(
+                    tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=poll_interval
+                )
+                # Streamers only support greedy search, so beams are disabled here
+                generation = submit_bounded(
+                    'inference', model.generate,
+                    **inputs,
+                    streamer=streamer,
+                    max_length=max_length,
+                    min_length=min(min_length, max_length),
+                    num_beams=1,
+                    do_sample=False,
+                    stopping_criteria=StoppingCriteriaList([_CancelledCriteria(cancel)])
+                )
+
+                pieces = []
+                while True:
+                    try:
+                        piece = next(streamer)
+                    except StopIteration:
+                        break
+                    except Empty:
+                        if generation.done() and generation.exception() is not None:
+                            break
+                        yield "heartbeat", None
+                        continue
+                    if piece:
+                        pieces.append(piece)
+                        yield "token", {"chunk": index, "text": piece}
+                generation.result()
+
+                partial = "".join(pieces).strip()
+                partials.append(partial)
+                if len(chunks) > 1:
+                    yield "partial", {"chunk": index, "summary": partial}
+
+            summary = " ".join(partials)
+            yield "summary", {
+                "summary": summary,
+                "original_length": sum(len(chunk.split()) for chunk in chunks),
+                "summary_length": len(summary.split())
+            }
+        finally:
+            # Covers client disconnects: closing the generator stops generation
+            cancel.set()
+            self._clear_gpu_memory()
+
     @lru_cache(maxsize=256)
     def extract_keywords(self, text, num_keywords=10):
         """Extract key phrases from the text."""
+        return self.extract_keywords_uncached(text, num_keywords)
+
+    def extract_keywords_uncached(self, text, num_keywords=10):
+        """Extract key phrases without keeping the text in the cache."""
         try:
             # Tokenize and remove stopwords
+            stop_words = self._get_stop_words()
             tokens = word_tokenize(text.lower())
             keywords = [word for word in tokens 
-                       if word.isalnum() and word not in self._stop_words]
+                       if word.isalnum() and word not in stop_words]
             
             # Count frequency
             freq_dist = FreqDist(keywords)
@@ -145,6 +271,7 @@ class TextProcessor:
         """Cleanup method to be called when shutting down."""
         self._sentiment_analyzer = None
         self._summarizer = None
+        self._summary_model = None
         self._clear_gpu_memory()
 
 # Create a singleton instance
@@ -157,5 +284,10 @@ def analyze_sentiment(text):
 def generate_summary(text, max_length=130, min_length=30):
     return text_processor.generate_summary(text, max_length, min_length)
 
-def extract_keywords(text, num_keywords=10):
+def stream_summary(text, max_length=130, min_length=30, cancel=None):
+    return text_processor.stream_summary(text, max_length, min_length, cancel)
+
+def extract_keywords(text, num_keywords=10, use_cache=True):
+    if not use_cache:
+        return text_processor.extract_keywords_uncached(text, num_keywords)
     return text_processor.extract_keywords(text, num_keywords)
\ No newline at end of file
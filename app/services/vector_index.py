@@ -0,0 +1,227 @@
+from contextlib import nullcontext
+import json
+import os
+import threading
+import numpy as np
+
+class VectorIndex:
+    """Append-only matrix of unit vectors kept in a memory-mapped file.
+
+    Queries are brute-force inner products over the mapped matrix until
+    build_ivf() has been run; after that only the rows in the inverted lists
+    closest to the query are scanned, which makes search approximate. At
+    least nprobe lists are scanned, or probe_fraction of them if that is
+    more, so recall holds up as the number of lists grows with the corpus.
+    Rows added later are assigned to their nearest list as they arrive.
+
+    The files may be shared between processes; callers serialize writes and
+    call refresh() to pick up rows and lists written elsewhere.
+    """
+
+    BLOCK_ROWS = 65536
+
+    def __init__(self, path, nprobe=8, probe_fraction=0.1):
+        self.path = path
+        self.nprobe = nprobe
+        self.probe_fraction = probe_fraction
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, 'vectors.f32')
+        self._meta_path = os.path.join(path, 'index.json')
+        self._centroids_path = os.path.join(path, 'centroids.npy')
+        self._lists_path = os.path.join(path, 'lists.i32')
+        self._lock = threading.Lock()
+
+        self.dim = None
+        self.ivf_rows = 0
+        self._count = 0
+        self._matrix = None
+        self._centroids = None
+        self._lists = None
+
+        self._centroids_mtime = None
+        self.refresh()
+
+    def __len__(self):
+        return self._count
+
+    def refresh(self, repair=False):
+        """Reload the row count and inverted lists from disk.
+
+        With repair, list assignments missing from disk (e.g. after a crash)
+        are written back; only do that while holding the write lock.
+        """
+        with self._lock:
+            if self.dim is None:
+                if not os.path.exists(self._meta_path):
+                    return
+                with open(self._meta_path) as f:
+                    self.dim = json.load(f)['dim']
+            count = 0
+            if os.path.exists(self._vectors_path):
+                count = os.path.getsize(self._vectors_path) // (self.dim * 4)
+
+            mtime = None
+            if os.path.exists(self._centroids_path):
+                mtime = os.path.getmtime(self._centroids_path)
+            if mtime != self._centroids_mtime or (mtime is not None and count != self._count):
+                with open(self._meta_path) as f:
+                    self.ivf_rows = json.load(f).get('ivf_rows', 0)
+                if mtime is not None:
+                    self._centroids = np.load(self._centroids_path)
+                    self._lists = np.fromfile(self._lists_path, dtype=np.int32)[:count]
+                self._centroids_mtime = mtime
+            self._count = count
+
+            if self._lists is not None and len(self._lists) < count:
+                missing = np.memmap(
+                    self._vectors_path, dtype=np.float32, mode='r', shape=(count, self.dim)
+                )[len(self._lists):]
+                assignments = self._assign(missing)
+                if repair:
+                    self._append_lists(assignments)
+                else:
+                    self._lists = np.concatenate([self._lists, assignments])
+
+    def truncate(self, rows):
+        """Drop rows past the given count, e.g. left over from a failed write."""
+        with self._lock:
+            if self.dim is None or rows >= self._count:
+                return
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(rows * self.dim * 4)
+            if self._lists is not None:
+                with open(self._lists_path, 'r+b') as f:
+                    f.truncate(rows * 4)
+                self._lists = self._lists[:rows]
+            self._count = rows
+            self._matrix = None
+
+    def _write_meta(self):
+        with open(self._meta_path, 'w') as f:
+            json.dump({"dim": self.dim, "ivf_rows": self.ivf_rows}, f)
+
+    def _view(self):
+        """Return the current matrix mapping and inverted list assignments."""
+        with self._lock:
+            if self._count == 0:
+                return np.empty((0, self.dim or 0), dtype=np.float32), self._lists
+            if self._matrix is None or len(self._matrix) != self._count:
+                self._matrix = np.memmap(
+                    self._vectors_path, dtype=np.float32, mode='r',
+                    shape=(self._count, self.dim)
+                )
+            return self._matrix, self._lists
+
+    def _assign(self, vectors, centroids=None):
+        centroids = self._centroids if centroids is None else centroids
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), self.BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + self.BLOCK_ROWS])
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def _append_lists(self, assignments):
+        with open(self._lists_path, 'ab') as f:
+            f.write(assignments.tobytes())
+        self._lists = np.concatenate([self._lists, assignments])
+
+    def add(self, vectors):
+        """Append unit vectors and return the row id of the first one."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_meta()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+            start = self._count
+            with open(self._vectors_path, 'ab') as f:
+                f.write(vectors.tobytes())
+            if self._centroids is not None:
+                self._append_lists(self._assign(vectors))
+            self._count += len(vectors)
+            return start
+
+    def rows(self, start, stop):
+        """Copy a contiguous range of vectors out of the mapping."""
+        return np.array(self._view()[0][start:stop])
+
+    def search(self, query, k=10, exclude=None, rows=None):
+        """Return (row ids, scores) of the k vectors closest to query.
+
+        exclude is an optional (start, stop) row range to leave out, and rows
+        limits the search to the first rows vectors.
+        """
+        matrix, lists = self._view()
+        if rows is not None:
+            matrix = matrix[:rows]
+        query = np.asarray(query, dtype=np.float32).ravel()
+        centroids = self._centroids
+
+        if centroids is not None and lists is not None:
+            n_probes = max(self.nprobe, int(np.ceil(self.probe_fraction * len(centroids))))
+            probes = np.argsort(centroids @ query)[::-1][:n_probes]
+            candidates = np.flatnonzero(np.isin(lists[:len(matrix)], probes))
+            scores = matrix[candidates] @ query
+        else:
+            candidates = None
+            scores = np.empty(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), self.BLOCK_ROWS):
+                scores[start:start + self.BLOCK_ROWS] = matrix[start:start + self.BLOCK_ROWS] @ query
+
+        if exclude is not None:
+            row_ids = candidates if candidates is not None else np.arange(len(scores))
+            scores[(row_ids >= exclude[0]) & (row_ids < exclude[1])] = -np.inf
+
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+        rows = candidates[top] if candidates is not None else top
+        return rows, scores[top]
+
+    def build_ivf(self, n_lists=None, iterations=10, sample_size=50000, seed=0, rows=None, commit_lock=None):
+        """Cluster the vectors with spherical k-means into inverted lists.
+
+        rows limits clustering to the first rows vectors, and commit_lock, if
+        given, is held only while the result is written out.
+        """
+        matrix, _ = self._view()
+        matrix = matrix[:rows]
+        count = len(matrix)
+        if count == 0:
+            return
+        n_lists = min(n_lists or max(1, int(np.sqrt(count))), count)
+        rng = np.random.default_rng(seed)
+
+        sample_rows = np.sort(rng.choice(count, min(count, sample_size), replace=False))
+        sample = np.array(matrix[sample_rows])
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            filled = np.bincount(assignments, minlength=n_lists) > 0
+            centroids[filled] = sums[filled]
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+
+        assignments = self._assign(matrix, centroids)
+        with commit_lock or nullcontext(), self._lock:
+            # Rows appended while clustering, here or elsewhere, still need a list
+            self._count = os.path.getsize(self._vectors_path) // (self.dim * 4)
+            if self._count > count:
+                extra = np.memmap(
+                    self._vectors_path, dtype=np.float32, mode='r',
+                    shape=(self._count, self.dim)
+                )[count:]
+                assignments = np.concatenate([assignments, self._assign(extra, centroids)])
+            np.save(self._centroids_path, centroids)
+            assignments.tofile(self._lists_path)
+            self._centroids = centroids
+            self._centroids_mtime = os.path.getmtime(self._centroids_path)
+            self._lists = assignments
+            self.ivf_rows = self._count
+            self._write_meta()
@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import threading
+from tempfile import SpooledTemporaryFile
+from asgiref.sync import AsyncToSync, SyncToAsync
+from asgiref.wsgi import WsgiToAsgiInstance
+from datetime import datetime
+from ..services.executors import shutdown_executors
+import json
+
+class AsgiAdapter:
+    """Serve the Flask app over ASGI.
+
+    Request bodies are received on the event loop and spooled to a temporary
+    file, so slow uploads hold a socket rather than a thread. The WSGI app
+    only runs once the body is complete, on a bounded request thread pool.
+    If the client disconnects mid-response, the response iterable is closed,
+    which lets streaming views stop their work.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.max_body_size = flask_app.config.get('MAX_CONTENT_LENGTH')
+        self.spool_size = flask_app.config.get('ASGI_SPOOL_SIZE', 1024 * 1024)
+        self.executor = ThreadPoolExecutor(
+            max_workers=flask_app.config.get('ASGI_REQUEST_THREADS', 32),
+            thread_name_prefix='flaskie-asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await _AsgiInstance(self)(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                shutdown_executors()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+class _AsgiInstance(WsgiToAsgiInstance):
+    def __init__(self, adapter):
+        super().__init__(adapter.flask_app)
+        self.adapter = adapter
+
+    async def __call__(self, scope, receive, send):
+        self.scope = scope
+        max_size = self.adapter.max_body_size
+        if max_size is not None and self._declared_length(scope) > max_size:
+            # Refuse before reading any of the body
+            await self._send_error(send, 413, "Request entity too large")
+            return
+        received = 0
+        with SpooledTemporaryFile(max_size=self.adapter.spool_size) as body:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                chunk = message.get('body', b'')
+                received += len(chunk)
+                if max_size is not None and received > max_size:
+                    await self._send_error(send, 413, "Request entity too large")
+                    return
+                body.write(chunk)
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+            self.sync_send = AsyncToSync(send)
+            disconnected = threading.Event()
+            watcher = asyncio.ensure_future(self._watch_disconnect(receive, disconnected))
+            try:
+                # asgiref's own runner is thread-sensitive, which would
+                # serialize every request onto a single thread
+                await SyncToAsync(
+                    partial(self._run_wsgi, body, disconnected),
+                    thread_sensitive=False,
+                    executor=self.adapter.executor
+                )()
+            finally:
+                watcher.cancel()
+
+    async def _watch_disconnect(self, receive, disconnected):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    def _run_wsgi(self, body, disconnected):
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            # Too many duplicate headers
+            self.sync_send({
+                'type': 'http.response.start',
+                'status': 400,
+                'headers': [(b'content-type', b'text/plain')]
+            })
+            self.sync_send({'type': 'http.response.body', 'body': b'Bad Request'})
+            return
+
+        iterable = self.wsgi_application(environ, self.start_response)
+        try:
+            for output in iterable:
+                if disconnected.is_set():
+                    return
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                if output:
+                    self.sync_send({'type': 'http.response.body', 'body': output, 'more_body': True})
+            if not self.response_started:
+                self.response_started = True
+                self.sync_send(self.response_start)
+            self.sync_send({'type': 'http.response.body'})
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+    @staticmethod
+    def _declared_length(scope):
+        for name, value in scope.get('headers', []):
+            if name.lower() == b'content-length':
+                try:
+                    return int(value)
+                except ValueError:
+                    return 0
+        return 0
+
+    async def _send_error(self, send, status_code, message):
+        # Same shape as ApiResponse.error, which needs an app context
+        payload = json.dumps({
+            "status": "error",
+            "message": message,
+            "timestamp": datetime.utcnow().isoformat(),
+            "errors": None
+        }).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(payload)).encode())
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': payload})
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import request, current_app
+from flask import request, current_app, Response
 from ..models.response import ApiResponse
 from cachetools import TTLCache
 import hashlib
@@ -57,8 +57,9 @@ def cache_response(timeout=300):
             # Get fresh response
             response = f(*args, **kwargs)
             
-            # Cache the response
-            response_cache[cache_key] = response
+            # Cache the response, unless it is a one-shot stream
+            if not (isinstance(response, Response) and response.is_streamed):
+                response_cache[cache_key] = response
             
             return response
         return decorated_function
@@ -0,0 +1,8 @@
+from app import create_app
+from app.utils.asgi import AsgiAdapter
+
+app = AsgiAdapter(create_app())
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app)
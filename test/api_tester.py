@@ -57,7 +57,7 @@ class APITester:
         print("Response:", json.dumps(response.json(), indent=2))
         return response.json()
     
-    def analyze_document(self, file_path):
+    def analyze_document(self, file_path, store=False):
         """Test document analysis endpoint"""
         if not self.access_token:
             print("Error: Not authenticated. Please login first.")
@@ -65,14 +65,109 @@ class APITester:
         
         endpoint = f"{self.base_url}/api/v1/documents/analyze"
         files = {"file": open(file_path, "rb")}
+        data = {"store": "true"} if store else {}
         headers = {"Authorization": f"Bearer {self.access_token}"}
         
-        response = requests.post(endpoint, files=files, headers=headers)
+        response = requests.post(endpoint, files=files, data=data, headers=headers)
         print(f"\n=== Document Analysis for: {file_path} ===")
         print(f"Status Code: {response.status_code}")
         print("Response:", json.dumps(response.json(), indent=2))
         return response.json()
     
+    def stream_summary(self, text):
+        """Test summary streaming as server-sent events"""
+        if not self.access_token:
+            print("Error: Not authenticated. Please login first.")
+            return
+        
+        endpoint = f"{self.base_url}/api/v1/analysis/summary"
+        payload = {"text": text, "stream": True}
+        
+        print("\n=== Streamed Summary ===")
+        events = []
+        with requests.post(endpoint, json=payload, headers=self.headers, stream=True) as response:
+            print(f"Status Code: {response.status_code}")
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    events.append({"event": event, "data": json.loads(line[len("data: "):])})
+                    print(f"{event}: {events[-1]['data']}")
+        return events
+    
+    def run_pipeline(self, file_path, analyses="summary,sentiment,keywords", export_format="json"):
+        """Test the document pipeline endpoint"""
+        if not self.access_token:
+            print("Error: Not authenticated. Please login first.")
+            return
+        
+        endpoint = f"{self.base_url}/api/v1/documents/pipeline"
+        files = {"file": open(file_path, "rb")}
+        data = {"analyses": analyses, "format": export_format}
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        
+        response = requests.post(endpoint, files=files, data=data, headers=headers)
+        print(f"\n=== Document Pipeline for: {file_path} ({export_format}) ===")
+        print(f"Status Code: {response.status_code}")
+        if export_format == "json" or response.status_code != 200:
+            print("Response:", json.dumps(response.json(), indent=2))
+            return response.json()
+        print(f"Received {len(response.content)} bytes of {response.headers.get('Content-Type')}")
+        return response.content
+    
+    def export_document(self, file_path, export_format="md", sheet=None, out_path=None):
+        """Test the document export endpoint, saving the download to out_path"""
+        if not self.access_token:
+            print("Error: Not authenticated. Please login first.")
+            return
+        
+        endpoint = f"{self.base_url}/api/v1/documents/export"
+        files = {"file": open(file_path, "rb")}
+        data = {"format": export_format}
+        if sheet:
+            data["sheet"] = sheet
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        out_path = out_path or f"{Path(file_path).stem}.{export_format}"
+        
+        print(f"\n=== Document Export for: {file_path} ({export_format}) ===")
+        with requests.post(endpoint, files=files, data=data, headers=headers, stream=True) as response:
+            print(f"Status Code: {response.status_code}")
+            if response.status_code != 200:
+                print("Response:", json.dumps(response.json(), indent=2))
+                return response.json()
+            with open(out_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+        print(f"Saved to {out_path}")
+        return out_path
+    
+    def search_documents(self, query, k=5):
+        """Test document search endpoint"""
+        if not self.access_token:
+            print("Error: Not authenticated. Please login first.")
+            return
+        
+        endpoint = f"{self.base_url}/api/v1/documents/search"
+        response = requests.get(endpoint, params={"q": query, "k": k}, headers=self.headers)
+        print(f"\n=== Document Search for: '{query}' ===")
+        print(f"Status Code: {response.status_code}")
+        print("Response:", json.dumps(response.json(), indent=2))
+        return response.json()
+    
+    def similar_documents(self, doc_id, k=5):
+        """Test similar documents endpoint"""
+        if not self.access_token:
+            print("Error: Not authenticated. Please login first.")
+            return
+        
+        endpoint = f"{self.base_url}/api/v1/documents/{doc_id}/similar"
+        response = requests.get(endpoint, params={"k": k}, headers=self.headers)
+        print(f"\n=== Documents Similar to: {doc_id} ===")
+        print(f"Status Code: {response.status_code}")
+        print("Response:", json.dumps(response.json(), indent=2))
+        return response.json()
+    
     def test_rate_limiting(self, text, num_requests=10, delay=0.1):
         """Test rate limiting by making multiple requests in quick succession"""
         print("\n=== Testing Rate Limiting ===")
@@ -132,6 +227,21 @@ def main():
     if Path("sample.txt").exists():
         api.analyze_document("sample.txt")
     
+    # Test summary streaming
+    api.stream_summary(sample_text * 5)
+    
+    # Test the pipeline, exports and search with an Office document
+    if Path("sample.docx").exists():
+        api.run_pipeline("sample.docx")
+        api.run_pipeline("sample.docx", export_format="md")
+        api.export_document("sample.docx", export_format="pdf")
+        stored = api.analyze_document("sample.docx", store=True)
+        api.search_documents("sample document")
+        if stored.get("status") == "success":
+            api.similar_documents(stored["data"]["id"])
+    if Path("sample.xlsx").exists():
+        api.export_document("sample.xlsx", export_format="csv")
+    
     # Test rate limiting
     rate_limit_results = api.test_rate_limiting(
         "Testing rate limiting with this text",
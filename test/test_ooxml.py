@@ -0,0 +1,237 @@
+"""Compare the streaming OOXML extractors with python-docx and python-pptx."""
+
+import pytest
+from docx import Document
+from docx.oxml import parse_xml
+from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
+from pptx import Presentation
+from pptx.util import Inches
+from app.services.doc_handler import document_text, process_docx, process_pptx
+from app.services.ooxml import iter_docx, iter_pptx
+
+MC_NS = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+WPS_NS = 'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+V_NS = 'xmlns:v="urn:schemas-microsoft-com:vml"'
+A_NS = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+P_NS = 'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+
+# python-docx reference
+
+def _docx_reference(path):
+    items = []
+    table_count = 0
+    for block in Document(path).iter_inner_content():
+        if isinstance(block, Paragraph):
+            items.append({"kind": "paragraph", "text": block.text})
+            continue
+        for row_number, row in enumerate(block.rows):
+            col = row.grid_cols_before
+            for tc in row._tr.tc_lst:
+                items.append({
+                    "kind": "cell",
+                    "table": table_count,
+                    "row": row_number,
+                    "col": col,
+                    "text": _cell_text(_Cell(tc, block))
+                })
+                col += tc.grid_span
+        table_count += 1
+    return items
+
+def _cell_text(cell):
+    lines = []
+    for block in cell.iter_inner_content():
+        if isinstance(block, Table):
+            lines.extend(
+                "\t".join(_cell_text(_Cell(tc, block)) for tc in row._tr.tc_lst)
+                for row in block.rows
+            )
+        else:
+            lines.append(block.text)
+    return "\n".join(lines)
+
+# python-pptx reference
+
+def _pptx_reference(path):
+    items = []
+    for number, slide in enumerate(Presentation(path).slides, 1):
+        items.append({"kind": "slide", "slide": number})
+        table_count = 0
+        for shape in _shapes(slide.shapes):
+            if shape.has_text_frame:
+                items.extend(
+                    {"kind": "paragraph", "slide": number, "text": paragraph.text.replace("\v", "\n")}
+                    for paragraph in shape.text_frame.paragraphs
+                )
+            elif getattr(shape, "has_table", False):
+                for row_number, row in enumerate(shape.table.rows):
+                    for col, cell in enumerate(row.cells):
+                        items.append({
+                            "kind": "cell", "slide": number, "table": table_count,
+                            "row": row_number, "col": col, "text": cell.text
+                        })
+                table_count += 1
+        if slide.has_notes_slide and slide.notes_slide.notes_text_frame.text:
+            items.append({"kind": "notes", "slide": number, "text": slide.notes_slide.notes_text_frame.text})
+    return items
+
+def _shapes(shapes):
+    for shape in shapes:
+        if shape.shape_type is not None and hasattr(shape, "shapes"):
+            yield from _shapes(shape.shapes)
+        else:
+            yield shape
+
+# Fixtures
+
+@pytest.fixture
+def docx_path(tmp_path):
+    document = Document()
+    document.add_paragraph("")
+    document.add_paragraph("Intro\twith tab")
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "a"
+    table.cell(0, 1).text = "b"
+    table.cell(1, 0).text = "c"
+    nested = table.cell(1, 0).add_table(rows=1, cols=2)
+    nested.cell(0, 0).text = "x"
+    nested.cell(0, 1).text = "y"
+    table.cell(1, 1).text = "d"
+
+    document.add_paragraph("Between tables")
+    merged = document.add_table(rows=2, cols=3)
+    merged.cell(0, 0).merge(merged.cell(0, 1)).text = "wide"
+    merged.cell(0, 2).text = "right"
+    for col, text in enumerate(["1", "2", "3"]):
+        merged.cell(1, col).text = text
+
+    document.add_paragraph("Outro")
+    path = tmp_path / "sample.docx"
+    document.save(path)
+    return str(path)
+
+@pytest.fixture
+def pptx_path(tmp_path):
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]
+
+    first = presentation.slides.add_slide(layout)
+    first.shapes.title.text = "Title"
+    first.placeholders[1].text = "Body line"
+    group = first.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1)).text = "grouped"
+    inner = group.shapes.add_group_shape()
+    inner.shapes.add_textbox(Inches(1), Inches(2), Inches(2), Inches(1)).text = "deeper"
+    first.notes_slide.notes_text_frame.text = "speaker notes"
+
+    second = presentation.slides.add_slide(presentation.slide_layouts[5])
+    second.shapes.title.text = "Table slide"
+    table = second.shapes.add_table(2, 2, Inches(1), Inches(2), Inches(4), Inches(2)).table
+    for row in range(2):
+        for col in range(2):
+            table.cell(row, col).text = f"r{row}c{col}"
+
+    third = presentation.slides.add_slide(presentation.slide_layouts[5])
+    third.shapes.title.text = "Last"
+
+    path = tmp_path / "sample.pptx"
+    presentation.save(path)
+    return str(path)
+
+# DOCX
+
+def test_docx_matches_python_docx(docx_path):
+    assert list(iter_docx(docx_path)) == _docx_reference(docx_path)
+
+def test_docx_nested_table_stays_in_its_cell(docx_path):
+    cells = [item for item in iter_docx(docx_path) if item["kind"] == "cell" and item["table"] == 0]
+    assert [(item["row"], item["col"]) for item in cells] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert cells[2]["text"].startswith("c\nx\ty")
+
+    content = process_docx(docx_path)["content"]
+    assert "a\tb\nc\nx\ty\n\td\n" in content
+    assert process_docx(docx_path)["tables"] == 2
+
+def test_docx_merged_cells_use_grid_columns(docx_path):
+    cells = [item for item in iter_docx(docx_path) if item["kind"] == "cell" and item["table"] == 1]
+    assert [(item["row"], item["col"], item["text"]) for item in cells] == [
+        (0, 0, "wide"), (0, 2, "right"), (1, 0, "1"), (1, 1, "2"), (1, 2, "3")
+    ]
+
+def test_docx_text_box_read_once(tmp_path):
+    document = Document()
+    run = document.add_paragraph().add_run("Caption")
+    run._r.append(parse_xml(
+        f'<mc:AlternateContent {MC_NS} {W_NS} {WPS_NS} {V_NS}>'
+        '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+        '<w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p>'
+        '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+        '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>'
+        '<w:p><w:r><w:t>BOXTEXT</w:t></w:r></w:p>'
+        '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>'
+        '</mc:AlternateContent>'
+    ))
+    path = str(tmp_path / "textbox.docx")
+    document.save(path)
+
+    assert list(iter_docx(path)) == [
+        {"kind": "paragraph", "text": "BOXTEXT"},
+        {"kind": "paragraph", "text": "Caption"}
+    ]
+
+def test_docx_limits(docx_path):
+    total = len(_docx_reference(docx_path))
+    assert process_docx(docx_path, max_items=total)["truncated"] is False
+    assert process_docx(docx_path)["truncated"] is False
+
+    items = list(iter_docx(docx_path, max_items=2))
+    assert items[-1] == {"kind": "truncated"}
+    assert len(items) == 3
+    result = process_docx(docx_path, max_items=2)
+    assert result["truncated"] is True
+    assert result["content"] == "\nIntro\twith tab"
+
+# PPTX
+
+def test_pptx_matches_python_pptx(pptx_path):
+    assert list(iter_pptx(pptx_path)) == _pptx_reference(pptx_path)
+
+def test_pptx_groups_tables_and_notes(pptx_path):
+    result = process_pptx(pptx_path)
+    assert result["slides"][0] == "Title\nBody line\ngrouped\ndeeper"
+    assert result["slides"][1] == "Table slide\nr0c0\tr0c1\nr1c0\tr1c1"
+    assert result["notes"] == ["speaker notes", "", ""]
+    assert result["slide_count"] == 3
+
+def test_pptx_alternate_content_read_once(pptx_path, tmp_path):
+    presentation = Presentation(pptx_path)
+    shape = (
+        f'<p:sp {P_NS} {A_NS}><p:nvSpPr><p:cNvPr id="99" name="Box"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+        '<p:spPr/><p:txBody><a:bodyPr/><a:p><a:r><a:t>{}</a:t></a:r></a:p></p:txBody></p:sp>'
+    )
+    presentation.slides[2].shapes._spTree.append(parse_xml(
+        f'<mc:AlternateContent {MC_NS} {P_NS} {A_NS}>'
+        f'<mc:Choice Requires="p">{shape.format("BOXTEXT")}</mc:Choice>'
+        f'<mc:Fallback>{shape.format("BOXTEXT")}</mc:Fallback>'
+        '</mc:AlternateContent>'
+    ))
+    path = str(tmp_path / "alternate.pptx")
+    presentation.save(path)
+
+    assert process_pptx(path)["slides"][2] == "Last\nBOXTEXT"
+
+def test_pptx_limits(pptx_path):
+    assert process_pptx(pptx_path, max_slides=3)["truncated"] is False
+    assert process_pptx(pptx_path)["truncated"] is False
+
+    result = process_pptx(pptx_path, max_slides=2)
+    assert result["truncated"] is True
+    assert result["slide_count"] == 2
+    assert list(iter_pptx(pptx_path, max_slides=2))[-1] == {"kind": "truncated"}
+
+def test_pptx_document_text_includes_notes(pptx_path):
+    text = document_text(process_pptx(pptx_path))
+    assert text.split("\n\n")[0] == "Title\nBody line\ngrouped\ndeeper\nspeaker notes"
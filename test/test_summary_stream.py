@@ -0,0 +1,115 @@
+"""Offline checks for streamed summaries, using a tiny randomly initialized BART."""
+
+import threading
+import time
+import pytest
+import torch
+from tokenizers import Tokenizer, models, pre_tokenizers, processors, trainers
+from transformers import BartConfig, BartForConditionalGeneration, PreTrainedTokenizerFast
+from app.services import executors, text_processor as text_processor_module
+from app.services.text_processor import TextProcessor
+
+WORDS = (
+    "the report covers quarterly revenue growth across regions while costs "
+    "stayed flat and the team expects demand to rise next year"
+).split()
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tiny-bart")
+    tokenizer = Tokenizer(models.WordLevel(unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.train_from_iterator(
+        [" ".join(WORDS)],
+        trainers.WordLevelTrainer(special_tokens=["<s>", "<pad>", "</s>", "<unk>"])
+    )
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", special_tokens=[("<s>", 0), ("</s>", 2)]
+    )
+    fast = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token="<s>", eos_token="</s>",
+        pad_token="<pad>", unk_token="<unk>", model_max_length=1024
+    )
+
+    torch.manual_seed(0)
+    config = BartConfig(
+        vocab_size=fast.vocab_size, d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2,
+        encoder_ffn_dim=32, decoder_ffn_dim=32, max_position_embeddings=2048,
+        bos_token_id=0, pad_token_id=1, eos_token_id=2, decoder_start_token_id=2,
+        forced_eos_token_id=None
+    )
+    model = BartForConditionalGeneration(config)
+    # Only emit real words, so every generated token shows up as text and
+    # generation runs until max_length unless it is cancelled
+    model.generation_config.suppress_tokens = [0, 1, 2, 3]
+    model.save_pretrained(path)
+    fast.save_pretrained(path)
+    return str(path)
+
+@pytest.fixture(autouse=True)
+def fresh_executors():
+    yield
+    executors.shutdown_executors()
+
+def _text(words):
+    return " ".join(WORDS[i % len(WORDS)] for i in range(words))
+
+def test_stream_events(tiny_model):
+    processor = TextProcessor(summary_model=tiny_model)
+    events = list(processor.stream_summary(
+        _text(60), max_length=8, min_length=4, chunk_words=30, poll_interval=0.1
+    ))
+    names = [name for name, _ in events]
+
+    assert "token" in names
+    assert [data["chunk"] for name, data in events if name == "partial"] == [0, 1]
+    assert names[-1] == "summary"
+    partials = [data["summary"] for name, data in events if name == "partial"]
+    assert events[-1][1]["summary"] == " ".join(partials)
+    assert events[-1][1]["original_length"] == 60
+
+def test_short_text_is_returned_as_is(tiny_model):
+    processor = TextProcessor(summary_model=tiny_model)
+    events = list(processor.stream_summary("too short", min_length=30))
+    assert events == [("summary", {"summary": "too short", "original_length": 2, "summary_length": 2})]
+
+def test_close_cancels_generation(tiny_model, monkeypatch):
+    futures = []
+
+    def recording_submit(name, fn, *args, **kwargs):
+        future = executors.submit_bounded(name, fn, *args, **kwargs)
+        futures.append(future)
+        return future
+
+    monkeypatch.setattr(text_processor_module, "submit_bounded", recording_submit)
+    processor = TextProcessor(summary_model=tiny_model)
+    cancel = threading.Event()
+    max_length = 2000
+    stream = processor.stream_summary(
+        _text(60), max_length=max_length, min_length=10, cancel=cancel, poll_interval=0.1
+    )
+    for name, _ in stream:
+        if name == "token":
+            break
+    stream.close()
+
+    assert cancel.is_set()
+    # The generation future finishes well before reaching max_length
+    output = futures[-1].result(timeout=30)
+    assert output.shape[1] < max_length
+
+def test_heartbeats_while_model_loads(tiny_model, monkeypatch):
+    processor = TextProcessor(summary_model=tiny_model)
+    load = processor._get_summary_model
+
+    def slow_load():
+        time.sleep(0.5)
+        return load()
+
+    monkeypatch.setattr(processor, "_get_summary_model", slow_load)
+    names = [name for name, _ in processor.stream_summary(
+        _text(60), max_length=8, min_length=4, poll_interval=0.1
+    )]
+    first_token = names.index("token")
+    assert names[:first_token].count("heartbeat") >= 3
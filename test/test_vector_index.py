@@ -0,0 +1,79 @@
+"""Approximate (IVF) search against brute force on clustered unit vectors."""
+
+import numpy as np
+import pytest
+from app.services.vector_index import VectorIndex
+
+DIM = 64
+
+def _clustered(rng, rows, clusters=100, spread=1.5):
+    centers = rng.standard_normal((clusters, DIM))
+    vectors = centers[rng.integers(clusters, size=rows)] + spread * rng.standard_normal((rows, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def _brute_force(vectors, query, k):
+    return np.argsort(-(vectors @ query))[:k].tolist()
+
+@pytest.fixture(scope="module")
+def vectors():
+    # Loose clusters: neighbours often sit in other lists, as with real embeddings
+    return _clustered(np.random.default_rng(0), 40100)
+
+@pytest.fixture
+def corpus(vectors):
+    return vectors[:40000]
+
+def _near(rng, vector, noise=0.01):
+    vector = vector + noise * rng.standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_planted_near_duplicates_match_brute_force(tmp_path, corpus):
+    rng = np.random.default_rng(1)
+    index = VectorIndex(str(tmp_path))
+    index.add(corpus)
+    index.build_ivf()
+
+    for original in rng.choice(len(corpus), 5, replace=False):
+        # Ten near-copies of one row become that row's true top ten
+        start = index.add(np.stack([_near(rng, corpus[original]) for _ in range(9)]))
+        planted = {int(original), *range(start, start + 9)}
+        matrix = np.asarray(index.rows(0, len(index)))
+        query = _near(rng, corpus[original])
+
+        rows, scores = index.search(query, 10)
+        assert set(rows.tolist()) == planted
+        assert rows.tolist() == _brute_force(matrix, query, 10)
+        assert np.allclose(scores, matrix[rows] @ query, atol=1e-5)
+
+def test_recall_against_brute_force(tmp_path, vectors, corpus):
+    index = VectorIndex(str(tmp_path))
+    index.add(corpus)
+    index.build_ivf()
+
+    # Held-out queries; a fixed 8 of the 200 lists only reaches about 0.93
+    queries = vectors[40000:]
+    recall = np.mean([
+        len(set(index.search(query, 10)[0].tolist()) & set(_brute_force(corpus, query, 10))) / 10
+        for query in queries
+    ])
+    assert recall >= 0.95
+
+def test_probes_scale_with_lists(tmp_path, corpus):
+    index = VectorIndex(str(tmp_path), nprobe=1, probe_fraction=0.25)
+    index.add(corpus[:5000])
+    index.build_ivf(n_lists=40)
+    query = corpus[0]
+
+    scanned = np.isin(index._lists, np.argsort(index._centroids @ query)[::-1][:10])
+    rows, _ = index.search(query, 5000)
+    # A quarter of 40 lists, not the nprobe floor of one
+    assert set(rows.tolist()) == set(np.flatnonzero(scanned).tolist())
+
+def test_rows_added_after_build_are_searchable(tmp_path, corpus):
+    index = VectorIndex(str(tmp_path))
+    index.add(corpus[:20000])
+    index.build_ivf()
+    start = index.add(corpus[20000:])
+
+    assert start == 20000
+    assert index.search(corpus[39999], 1)[0].tolist() == [39999]